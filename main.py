@@ -1,10 +1,16 @@
 import os
 import requests
-from bs4 import BeautifulSoup
-import base64
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+from lxml import html as lxml_html
+import binascii
+import hashlib
+import html
+import orjson
 import re 
-from urllib.parse import urljoin 
+import socket
+from urllib.parse import urljoin, unquote_to_bytes
 
 # --- Configuration ---
 SCRAPE_URL = "https://intern.aiaxuropenings.com/scrape/e0681d59-2dbb-4b32-91b6-1e4da0c4a0f4"
@@ -19,71 +25,343 @@ HEADERS = {
 
 MODEL_NAME = "microsoft-florence-2-large"
 PROMPT_TAG = "<DETAILED_CAPTION>"
+MAX_TOKENS = 500
 
-def scrape_image():
+# The prompt half of the chat message never changes; built once and shared by every payload.
+PROMPT_CONTENT = {"type": "text", "text": PROMPT_TAG}
+
+# Opt-in: upload the raw image as multipart/form-data instead of a base64 data URL inside JSON.
+# Only worth enabling for endpoints known to accept it; a rejection is remembered in the cache
+# and the JSON path is used from then on.
+API_ACCEPTS_MULTIPART = os.getenv("API_ACCEPTS_MULTIPART") == "1"
+# Statuses that mean "this endpoint doesn't take multipart" on their own; any other 4xx only
+# counts (and is remembered) when its body says "unsupported".
+MULTIPART_UNSUPPORTED_STATUSES = {405, 415}
+
+CACHE_DIR = ".cache"
+CACHE_KEY_SLICE_CHARS = 64 * 1024 # Data URL slice size when hashing an image for its cache key
+
+# Verbose progress output (set DEBUG=1, true or yes); errors and step results are always printed.
+DEBUG = os.getenv("DEBUG", "").strip().lower() in ("1", "true", "yes")
+
+# Image downloads are already compressed, so skip the decode work. The scrape page keeps the
+# session's default Accept-Encoding, which urllib3 builds from the decoders it can actually import.
+IMAGE_ACCEPT_ENCODING = "identity"
+
+# TCP keep-alive probe timing (seconds), applied where the platform exposes the options.
+# The OS default idle time (~2 hours) would never probe within a run.
+TCP_KEEPALIVE_IDLE = 15
+TCP_KEEPALIVE_INTERVAL = 5
+
+class KeepAliveAdapter(HTTPAdapter):
     """
-    Scrapes the image from the specified URL.
-    Returns the image content (bytes) and its content type.
+    HTTPAdapter whose pooled sockets disable Nagle (urllib3's default) and enable
+    TCP keep-alive probes after a short idle time, so a connection dropped while
+    pooled is detected. Reuse between steps itself comes from HTTP keep-alive.
+    Applies to proxied connections too.
     """
-    print(f"Step 1: Scraping image from {SCRAPE_URL}...")
+    socket_options = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, TCP_KEEPALIVE_IDLE))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, TCP_KEEPALIVE_INTERVAL))
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", self.socket_options)
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs.setdefault("socket_options", self.socket_options)
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+# Shared session: keeps connections alive between the three steps, so the
+# inference and submit calls (same host) reuse one TCP/TLS connection.
+# HEADERS (with the bearer token) are passed per API call, never set on the session,
+# so the image download - whose URL comes from scraped HTML - doesn't receive them.
+SESSION = requests.Session()
+_adapter = KeepAliveAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+# Fast path for the first <img src="...">, matched on the raw page bytes without building a tree.
+# Steps over whole attributes so quoted values can't fake a src. Only trusted when it hits the
+# page's first <img> and no comment, script or textarea precedes it (see extract_image).
+IMG_SRC_RE = re.compile(
+    rb'<img\b(?:\s+[^\s=>]+(?:\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+))?)*?\s+src\s*=\s*(["\'])(.*?)\1',
+    re.IGNORECASE | re.DOTALL,
+)
+IMG_TAG_RE = re.compile(rb'<img\b', re.IGNORECASE)
+# Markup whose contents a regex can't tell apart from real tags
+OPAQUE_MARKUP_RE = re.compile(rb'<!--|<script\b|<textarea\b', re.IGNORECASE)
+
+# Leading bytes identifying common image formats; checked before trusting a declared mediatype.
+IMAGE_MAGIC_NUMBERS = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG', 'image/png'),
+    (b'GIF8', 'image/gif'),
+)
+
+# Characters outside the base64 alphabet (whitespace, padding, ...), dropped before sniffing.
+NON_BASE64_RE = re.compile(r'[^A-Za-z0-9+/]')
+
+# How much of an error response body to show; the rest is never read.
+ERROR_PREVIEW_BYTES = 1024
+
+# Read size for streamed downloads; a multiple of 3 so each block base64-encodes without padding.
+B64_CHUNK_SIZE = 3 * 64 * 1024
+
+def log(*args, **kwargs):
+    """
+    Prints only when DEBUG is enabled.
+    """
+    if DEBUG:
+        print(*args, **kwargs)
+
+def cache_key(*parts, image_data_url=None):
+    """
+    Returns a short hex digest identifying the given strings in the on-disk cache.
+    If `image_data_url` is given, its payload (after the comma) is hashed too, in
+    slices so the multi-MB string is never encoded as a whole.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    if image_data_url is not None:
+        for start in range(image_data_url.find(',') + 1, len(image_data_url), CACHE_KEY_SLICE_CHARS):
+            digest.update(image_data_url[start:start + CACHE_KEY_SLICE_CHARS].encode('utf-8'))
+    return digest.hexdigest()
+
+def load_cache(key):
+    """
+    Returns the cached JSON value stored under `key`, or None if absent or unreadable.
+    """
+    path = os.path.join(CACHE_DIR, f"{key}.json")
+    if not os.path.exists(path):
+        return None
     try:
-        response = requests.get(SCRAPE_URL, timeout=30)
-        response.raise_for_status() # Raise an exception for HTTP errors
-        soup = BeautifulSoup(response.content, 'html.parser')
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError) as e:
+        print(f"WARNING: Ignoring unreadable cache entry {path}: {e}")
+        return None
 
-        # Find the image tag - adjust if the structure is different
-        img_tag = soup.find('img')
-        if not img_tag or not img_tag.get('src'):
-            print("ERROR: Image tag or src attribute not found on the page.")
-            return None, None
+def save_cache(key, value):
+    """
+    Stores a JSON-serializable value under `key`. Failures only print a warning.
+    """
+    path = os.path.join(CACHE_DIR, f"{key}.json")
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(value))
+    except OSError as e:
+        print(f"WARNING: Could not write cache entry {path}: {e}")
+
+def sniff_image_type(head):
+    """
+    Returns the image MIME type implied by the first (at least 12) bytes, or None if unknown.
+    """
+    for magic, content_type in IMAGE_MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return content_type
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+def sniff_base64_image_type(encoded_data):
+    """
+    Sniffs the image MIME type from the start of a base64 payload. This is only a
+    hint: returns None if the prefix is percent-encoded or can't be decoded.
+    """
+    window = encoded_data[:64]
+    if '%' in window:
+        return None
+    head = NON_BASE64_RE.sub('', window)[:16] # 16 base64 chars decode to 12 bytes
+    head = head[:len(head) - len(head) % 4]
+    try:
+        return sniff_image_type(binascii.a2b_base64(head))
+    except binascii.Error:
+        return None
+
+def print_error_preview(response):
+    """
+    Prints the start of a streamed error response without buffering the rest of it.
+    """
+    # iter_content (unlike raw.read) wraps urllib3 read errors as requests exceptions
+    preview = next(response.iter_content(ERROR_PREVIEW_BYTES), b'')
+    print(f"Response content (first {ERROR_PREVIEW_BYTES} bytes): {preview.decode('utf-8', 'replace')}")
+
+def encode_data_url(image_content, content_type):
+    """
+    Builds a base64 data URL from in-memory image bytes, encoding chunk by
+    chunk into a buffer presized to the exact output length.
+    """
+    prefix = f"data:{content_type};base64,".encode('ascii')
+    view = memoryview(image_content)
+    buf = bytearray(len(prefix) + ((len(view) + 2) // 3) * 4)
+    buf[:len(prefix)] = prefix
+    offset = len(prefix)
+    for start in range(0, len(view), B64_CHUNK_SIZE):
+        encoded = binascii.b2a_base64(view[start:start + B64_CHUNK_SIZE], newline=False)
+        buf[offset:offset + len(encoded)] = encoded
+        offset += len(encoded)
+    return buf.decode('ascii')
 
-        image_src = img_tag['src']
-        print(f"Found image src (first 100 chars): {image_src[:100]}...")
-
-        if image_src.startswith('data:'):
-            print("Image source is a data URL. Parsing directly.")
-            try:
-                # Format: data:[<mediatype>][;base64],<data>
-                header, encoded_data = image_src.split(',', 1)
-                
-                # Extract mediatype using regex
-                match = re.search(r'data:([^;]+)(;base64)?', header)
-                if not match:
+def stream_data_url(response, content_type):
+    """
+    Base64-encodes a streamed response body straight into a data URL,
+    so the raw image bytes are never held in memory as a whole.
+    """
+    prefix = f"data:{content_type};base64,".encode('ascii')
+    content_length = int(response.headers.get('Content-Length') or 0)
+    # Presize for the expected output; the buffer still grows/shrinks if the length was off.
+    buf = bytearray(len(prefix) + ((content_length + 2) // 3) * 4)
+    buf[:len(prefix)] = prefix
+    offset = len(prefix)
+    tail = b''
+    # iter_content (unlike raw.read) wraps urllib3 read errors as requests exceptions
+    for block in response.iter_content(B64_CHUNK_SIZE):
+        if tail:
+            block = tail + block
+        cut = len(block) - len(block) % 3 # Keep base64 aligned across blocks
+        tail = block[cut:]
+        encoded = binascii.b2a_base64(memoryview(block)[:cut], newline=False)
+        buf[offset:offset + len(encoded)] = encoded
+        offset += len(encoded)
+    if tail:
+        encoded = binascii.b2a_base64(tail, newline=False)
+        buf[offset:offset + len(encoded)] = encoded
+        offset += len(encoded)
+    del buf[offset:]
+    return buf.decode('ascii')
+
+def extract_image(response):
+    """
+    Finds the first <img> on the scraped page and resolves it to a data URL.
+    Returns the image as a base64 data URL (str) and its content type.
+    """
+    # Find the image tag - try the regex fast path first, then fall back to a real parse
+    page = response.content
+    match = IMG_SRC_RE.search(page)
+    first_img = IMG_TAG_RE.search(page)
+    if (match and match.start() == first_img.start()
+            and not OPAQUE_MARKUP_RE.search(page, 0, match.start())):
+        image_src = match.group(2).decode('utf-8')
+        if '&' in image_src:
+            image_src = html.unescape(image_src)
+    else:
+        img_tag = lxml_html.fromstring(page).find('.//img')
+        image_src = img_tag.get('src') if img_tag is not None else None
+
+    if not image_src:
+        print("ERROR: Image tag or src attribute not found on the page.")
+        return None, None
+
+    log(f"Found image src (first 100 chars): {image_src[:100]}...")
+
+    if image_src.startswith('data:'):
+        log("Image source is a data URL. Parsing directly.")
+        try:
+            # Format: data:[<mediatype>][;base64],<data>
+            # Only the header is sliced out; the (multi-MB) data is never copied unless needed
+            comma = image_src.find(',')
+            if comma == -1:
+                raise ValueError("data URL has no ',' separating header and data")
+            header = image_src[:comma]
+            
+            # ";base64", if present, is always the last token before the comma
+            is_base64 = header.endswith(';base64')
+            mediatype = header[5:-7] if is_base64 else header[5:] # Slice off "data:" (and ";base64")
+            declared_type = mediatype.partition(';')[0].strip() # e.g., "image/jpeg"
+
+            if is_base64:
+                # The magic number wins over the declared type
+                content_type = sniff_base64_image_type(image_src[comma + 1:comma + 65]) or declared_type
+                if not content_type:
                     print("ERROR: Could not extract mediatype from data URL header.")
                     return None, None
-                
-                content_type = match.group(1).strip() # e.g., "image/jpeg"
-                
-                if ';base64' in header:
-                    image_content = base64.b64decode(encoded_data)
-                    print(f"Image parsed from base64 data URL successfully ({len(image_content)} bytes, type: {content_type}).")
-                    return image_content, content_type
-                else:
-                    # Handle URL-encoded data if necessary (less common for images this large)
-                    from urllib.parse import unquote_to_bytes # Local import for less common case
-                    image_content = unquote_to_bytes(encoded_data)
-                    print(f"Image parsed from URL-encoded data URL successfully ({len(image_content)} bytes, type: {content_type}).")
-                    return image_content, content_type
-
-            except ValueError as e:
-                print(f"ERROR parsing data URL (ValueError): {e}")
-                return None, None
-            except Exception as e:
-                print(f"An unexpected error occurred while parsing data URL: {e}")
-                return None, None
-        else:
-            # It's a regular URL (absolute or relative)
-            image_url_absolute = urljoin(SCRAPE_URL, image_src) # Use urljoin for robust URL construction
-            print(f"Image source is a standard URL. Downloading from: {image_url_absolute}")
-            
-            image_response = requests.get(image_url_absolute, timeout=30)
+                if content_type != declared_type:
+                    image_src = f"data:{content_type};base64,{image_src[comma + 1:]}"
+                # Otherwise already in the form the inference API expects; pass it through
+                # untouched instead of decoding and re-encoding the whole payload.
+                log(f"Image found as base64 data URL ({len(image_src) - image_src.find(',') - 1} base64 chars, type: {content_type}).")
+                return image_src, content_type
+            else:
+                # Handle URL-encoded data if necessary (less common for images this large)
+                image_content = unquote_to_bytes(image_src[comma + 1:])
+                content_type = sniff_image_type(image_content[:12]) or declared_type
+                if not content_type:
+                    print("ERROR: Could not extract mediatype from data URL header.")
+                    return None, None
+                log(f"Image parsed from URL-encoded data URL successfully ({len(image_content)} bytes, type: {content_type}).")
+                return encode_data_url(image_content, content_type), content_type
+
+        except ValueError as e:
+            print(f"ERROR parsing data URL (ValueError): {e}")
+            return None, None
+        except Exception as e:
+            print(f"An unexpected error occurred while parsing data URL: {e}")
+            return None, None
+    else:
+        # It's a regular URL (absolute or relative)
+        image_url_absolute = urljoin(SCRAPE_URL, image_src) # Use urljoin for robust URL construction
+        log(f"Image source is a standard URL. Downloading from: {image_url_absolute}")
+        
+        with SESSION.get(image_url_absolute, headers={"Accept-Encoding": IMAGE_ACCEPT_ENCODING},
+                         stream=True, timeout=30) as image_response:
             image_response.raise_for_status()
-            image_content = image_response.content
             # Try to get content_type from header, default to 'image/jpeg' or try to infer if possible
             content_type = image_response.headers.get('Content-Type', 'image/jpeg') 
-            
-            print(f"Image downloaded successfully ({len(image_content)} bytes, type: {content_type}).")
-            return image_content, content_type
+            image_data_url = stream_data_url(image_response, content_type)
+
+        log(f"Image downloaded successfully ({len(image_data_url)} data URL chars, type: {content_type}).")
+        return image_data_url, content_type
+
+def scrape_image():
+    """
+    Scrapes the image from the specified URL, revalidating a cached copy
+    with If-None-Match / If-Modified-Since when one exists.
+    Returns the image as a base64 data URL (str) and its content type.
+    """
+    print(f"Step 1: Scraping image from {SCRAPE_URL}...")
+    scrape_cache_key = cache_key(SCRAPE_URL)
+    try:
+        cached = load_cache(scrape_cache_key)
+        if not (isinstance(cached, dict)
+                and isinstance(cached.get('image_data_url'), str)
+                and isinstance(cached.get('content_type'), str)):
+            cached = None # Missing or malformed entry: treat as a cache miss
+        page_headers = {}
+        if cached:
+            if isinstance(cached.get('etag'), str):
+                page_headers['If-None-Match'] = cached['etag']
+            if isinstance(cached.get('last_modified'), str):
+                page_headers['If-Modified-Since'] = cached['last_modified']
+
+        response = SESSION.get(SCRAPE_URL, headers=page_headers, timeout=30)
+        if cached and response.status_code == 304:
+            log(f"Scrape page not modified; using cached image (type: {cached['content_type']}).")
+            return cached['image_data_url'], cached['content_type']
+        response.raise_for_status() # Raise an exception for HTTP errors
+
+        image_data_url, content_type = extract_image(response)
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if image_data_url and (etag or last_modified):
+            save_cache(scrape_cache_key, {
+                "etag": etag,
+                "last_modified": last_modified,
+                "image_data_url": image_data_url,
+                "content_type": content_type,
+            })
+        return image_data_url, content_type
 
     except requests.exceptions.RequestException as e:
         print(f"ERROR in Step 1 (Scraping/Downloading): {e}")
@@ -92,56 +370,112 @@ def scrape_image():
         print(f"An unexpected error occurred in Step 1: {e}")
         return None, None
 
-def send_image_for_inference(image_content, image_content_type):
+def build_inference_payload(image_data_url):
+    """
+    Returns the chat-completions payload for one image. Only the image part is
+    built per call; the prompt part is the shared PROMPT_CONTENT.
+    """
+    return {
+        "model": MODEL_NAME,
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    PROMPT_CONTENT,
+                    {"type": "image_url", "image_url": {"url": image_data_url}},
+                ]
+            }
+        ],
+        "max_tokens": MAX_TOKENS
+    }
+
+def send_image_multipart(image_data_url, image_content_type):
+    """
+    Sends the image to the AI model as raw bytes in a multipart/form-data upload.
+    Returns the JSON response from the model, or None if the endpoint does not
+    accept multipart uploads or the data URL can't be decoded (the caller should
+    then fall back to JSON).
+    """
+    unsupported_key = cache_key("multipart-unsupported", API_CHAT_COMPLETIONS_URL)
+    if load_cache(unsupported_key):
+        return None
+
+    try:
+        image_content = binascii.a2b_base64(image_data_url.partition(',')[2])
+    except binascii.Error as e:
+        log(f"Could not decode data URL for multipart upload ({e}); falling back to JSON.")
+        return None
+
+    with SESSION.post(
+        API_CHAT_COMPLETIONS_URL,
+        files={"image": ("image", image_content, image_content_type)},
+        data={"model": MODEL_NAME, "prompt": PROMPT_TAG},
+        headers={"Authorization": HEADERS["Authorization"]}, # Let requests set the multipart Content-Type
+        stream=True,
+        timeout=60,
+    ) as response:
+        log(f"API Chat Completions (multipart) Status Code: {response.status_code}")
+        if 400 <= response.status_code < 500:
+            preview = next(response.iter_content(ERROR_PREVIEW_BYTES), b'')
+            if response.status_code in MULTIPART_UNSUPPORTED_STATUSES or b'unsupported' in preview.lower():
+                log("Multipart upload not supported by the endpoint; falling back to JSON.")
+                save_cache(unsupported_key, True)
+            else:
+                log(f"Multipart upload rejected ({response.status_code}); falling back to JSON for this request.")
+            return None
+        if not response.ok:
+            print_error_preview(response)
+            response.raise_for_status()
+        return orjson.loads(response.content)
+
+def send_image_for_inference(image_data_url, image_content_type):
     """
     Sends the image to the AI model for inference.
     Returns the JSON response from the model.
     """
-    if not image_content or not image_content_type:
+    if not image_data_url:
         print("ERROR: Cannot proceed to Step 2 without image content.")
         return None
 
+    # Key on the image itself plus everything else that shapes the model's answer.
+    inference_cache_key = cache_key(MODEL_NAME, PROMPT_TAG, str(MAX_TOKENS), image_content_type,
+                                    image_data_url=image_data_url)
+    cached = load_cache(inference_cache_key)
+    if cached is not None:
+        print("Step 2: Using cached model response for this image.")
+        return cached
+
     print(f"Step 2: Sending image for inference to {API_CHAT_COMPLETIONS_URL}...")
     try:
-        base64_image = base64.b64encode(image_content).decode('utf-8')
-        image_data_url = f"data:{image_content_type};base64,{base64_image}"
-
-        payload = {
-            "model": MODEL_NAME,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": PROMPT_TAG},
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": image_data_url
-                            }
-                        }
-                    ]
-                }
-            ],
-            "max_tokens": 500 
-        }
-
-        response = requests.post(API_CHAT_COMPLETIONS_URL, headers=HEADERS, json=payload, timeout=60)
-        print(f"API Chat Completions Status Code: {response.status_code}")
+        if API_ACCEPTS_MULTIPART:
+            model_response_json = send_image_multipart(image_data_url, image_content_type)
+            if model_response_json is not None:
+                log("Inference successful. Model response received.")
+                save_cache(inference_cache_key, model_response_json)
+                return model_response_json
 
-        response.raise_for_status()
-        model_response_json = response.json()
-        print("Inference successful. Model response received.")
+        payload = build_inference_payload(image_data_url)
+
+        # Stream so a large error page is never buffered; the body is only read on success.
+        with SESSION.post(API_CHAT_COMPLETIONS_URL, headers=HEADERS, data=orjson.dumps(payload),
+                          stream=True, timeout=60) as response:
+            log(f"API Chat Completions Status Code: {response.status_code}")
+            if not response.ok:
+                print_error_preview(response)
+                response.raise_for_status()
+            model_response_json = orjson.loads(response.content)
+        log("Inference successful. Model response received.")
+        save_cache(inference_cache_key, model_response_json)
         return model_response_json
 
     except requests.exceptions.RequestException as e:
         print(f"ERROR in Step 2 (Inference): {e}")
-        if 'response' in locals() and response is not None:
-            print(f"Response content: {response.text}")
         return None
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"ERROR in Step 2 (JSON Decode): {e}")
         if 'response' in locals() and response is not None:
-            print(f"Response content that failed to parse: {response.text}")
+            preview = response.content[:ERROR_PREVIEW_BYTES].decode('utf-8', 'replace')
+            print(f"Response content that failed to parse (first {ERROR_PREVIEW_BYTES} bytes): {preview}")
         return None
 
 
@@ -155,14 +489,20 @@ def submit_model_response(model_response_json):
 
     print(f"Step 3: Submitting model response to {API_SUBMIT_RESPONSE_URL}...")
     try:
-        response = requests.post(API_SUBMIT_RESPONSE_URL, headers=HEADERS, json=model_response_json, timeout=30)
-        print(f"API Submit Response Status Code: {response.status_code}")
-        print(f"API Submit Response Text: {response.text}") 
+        response = SESSION.post(API_SUBMIT_RESPONSE_URL, headers=HEADERS, data=orjson.dumps(model_response_json), timeout=30)
+        log(f"API Submit Response Status Code: {response.status_code}")
+        if DEBUG:
+            print(f"API Submit Response Text: {response.text}")
 
         response.raise_for_status()
-        print("Model response submitted successfully.")
+        log("Model response submitted successfully.")
         
-        if "sucesso" in response.text.lower() or "correct" in response.text.lower() or response.status_code == 200:
+        # Status first; only otherwise lowercase the raw bytes (no charset detection) for the markers
+        confirmed = response.status_code == 200
+        if not confirmed:
+            body = response.content.lower()
+            confirmed = b"sucesso" in body or b"correct" in body
+        if confirmed:
              print("Submission seems to be confirmed as correct by the server.")
              return True
         else:
@@ -174,7 +514,7 @@ def submit_model_response(model_response_json):
         if 'response' in locals() and response is not None:
             print(f"Response content: {response.text}")
         return False
-    except json.JSONDecodeError as e: 
+    except orjson.JSONDecodeError as e: 
         print(f"ERROR in Step 3 (JSON Decode of server response): {e}")
         print(f"Response content that failed to parse: {response.text}")
         return False
@@ -182,10 +522,10 @@ def submit_model_response(model_response_json):
 def main():
     print("--- Starting Technical Evaluation Script ---")
 
-    image_bytes, image_type = scrape_image()
+    image_data_url, image_type = scrape_image()
 
-    if image_bytes and image_type:
-        model_output_json = send_image_for_inference(image_bytes, image_type)
+    if image_data_url and image_type:
+        model_output_json = send_image_for_inference(image_data_url, image_type)
 
         if model_output_json:
             submission_successful = submit_model_response(model_output_json)